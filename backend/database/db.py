@@ -4,16 +4,46 @@ Handles all database operations using SQLite/SQLAlchemy
 """
 
 import os
+import time
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-import json
+import orjson
 import asyncio
-import uuid
+import bisect
+import base64
+import binascii
+from collections import deque
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Fold a collection's append-only log into its snapshot once it grows past this
+LOG_COMPACT_BYTES = 4 * 1024 * 1024
+
+# Changes made within this window are coalesced into a single log write
+FLUSH_DELAY = 0.1
+
+# Random ids are drawn from os.urandom this many at a time
+ID_BATCH_SIZE = 256
+
+# Large per-project payloads left out of summary listings; fetch the project to get them
+HEAVY_PROJECT_FIELDS = frozenset({"analysis", "dependencies", "plan", "code", "project"})
+
+# Server-side bookkeeping kept on records but never handed out by the API
+INTERNAL_FIELDS = frozenset({"job"})
+
+# [epoch second, "YYYY-MM-DDTHH:MM:SS"] for the most recent timestamp
+_ts_cache = [-1, ""]
+
+def now_iso() -> str:
+    """UTC ISO-8601 timestamp with microseconds, formatting the date part once per second"""
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    if second != _ts_cache[0]:
+        _ts_cache[1] = datetime.utcfromtimestamp(second).isoformat()
+        _ts_cache[0] = second
+    return f"{_ts_cache[1]}.{nanos // 1000:06d}"
+
 class Database:
     """Simple file-based database for development"""
     
@@ -22,42 +52,80 @@ class Database:
         self.db_dir.mkdir(exist_ok=True, parents=True)
         self.projects_file = self.db_dir / "projects.json"
         self.builds_file = self.db_dir / "builds.json"
+        self.projects_log = self.db_dir / "projects.log"
+        self.builds_log = self.db_dir / "builds.log"
         
         self.projects = {}
         self.builds = {}
+        
+        # (created_at, id) for every project, kept sorted so listing is a slice
+        self._project_order = []
+        
+        # Open append handles and bytes written per collection log
+        self._logs = {}
+        self._log_sizes = {}
+        
+        # Snapshot generation per collection; each log starts with a marker naming the
+        # generation its entries apply to, so a stale log is never replayed over a newer snapshot
+        self._generations = {"projects": 0, "builds": 0}
+        
+        # Changes queued since the last flush, per collection: id -> merged patch
+        # fields, or None to write the whole record (dicts keep insertion order)
+        self._pending = {"projects": {}, "builds": {}}
+        self._dirty = asyncio.Event()
+        self._flush_task = None
+        self._closing = False
+        
+        # Encoded form of each record, reused until the record changes
+        self._encoded = {"projects": {}, "builds": {}}
+        
+        self._id_pool = deque()
     
     async def initialize(self):
         """Initialize database"""
         logger.info("Initializing database...")
         
-        # Load existing data
-        if self.projects_file.exists():
-            with open(self.projects_file, 'r') as f:
-                self.projects = json.load(f)
+        # Load snapshots, then replay anything logged since the last compaction
+        self.projects, self._generations["projects"] = await asyncio.to_thread(
+            self._load, self.projects_file, self.projects_log
+        )
+        self.builds, self._generations["builds"] = await asyncio.to_thread(
+            self._load, self.builds_file, self.builds_log
+        )
+        self._project_order = sorted(
+            (project.get("created_at", ""), project_id) for project_id, project in self.projects.items()
+        )
         
-        if self.builds_file.exists():
-            with open(self.builds_file, 'r') as f:
-                self.builds = json.load(f)
+        self._flush_task = asyncio.create_task(self._flush_loop())
         
         logger.info(f"Database initialized with {len(self.projects)} projects and {len(self.builds)} builds")
     
+    def _new_id(self) -> str:
+        """Generate a random 128-bit hex id, amortizing the entropy syscall over a batch"""
+        if not self._id_pool:
+            raw = os.urandom(16 * ID_BATCH_SIZE)
+            self._id_pool.extend(raw[i:i + 16].hex() for i in range(0, len(raw), 16))
+        return self._id_pool.popleft()
+    
     async def health_check(self) -> bool:
         """Check database health"""
         return self.db_dir.exists()
     
     async def create_project(self, data: Dict[str, Any]) -> str:
         """Create a new project"""
-        project_id = str(uuid.uuid4())
+        project_id = self._new_id()
+        now = now_iso()
         
         project = {
             "id": project_id,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             **data
         }
         
         self.projects[project_id] = project
-        await self._save_projects()
+        bisect.insort(self._project_order, (project.get("created_at", ""), project_id))
+        self._mark_dirty("projects", project_id)
         
         logger.info(f"Created project {project_id}")
         return project_id
@@ -66,41 +134,119 @@ class Database:
         """Get project by ID"""
         return self.projects.get(project_id)
     
+    async def get_project_serialized(self, project_id: str) -> Optional[bytes]:
+        """Get project by ID as JSON bytes (without INTERNAL_FIELDS), cached until the project changes"""
+        project = self.projects.get(project_id)
+        if project is None:
+            return None
+        if INTERNAL_FIELDS.isdisjoint(project):
+            return self._encode("projects", project_id, project)
+        # Only while a job runs; the cached encoding is the stored form, job included
+        return orjson.dumps({k: v for k, v in project.items() if k not in INTERNAL_FIELDS})
+    
     async def update_project(self, project_id: str, data: Dict[str, Any]):
         """Update project"""
-        if project_id in self.projects:
-            self.projects[project_id].update(data)
-            self.projects[project_id]["updated_at"] = datetime.utcnow().isoformat()
-            await self._save_projects()
+        project = self.projects.get(project_id)
+        if project is not None:
+            if "created_at" in data:
+                self._unindex_project(project)
+                bisect.insort(self._project_order, (data["created_at"], project_id))
+            # Copy-on-write: readers holding the previous dict never see a half-applied update
+            changes = {**data, "updated_at": now_iso()}
+            self.projects[project_id] = {**project, **changes}
+            self._mark_dirty("projects", project_id, changes)
             logger.info(f"Updated project {project_id}")
     
-    async def list_projects(self, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
-        """List all projects"""
-        all_projects = list(self.projects.values())
-        # Sort by created_at desc
-        all_projects.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return all_projects[skip:skip+limit]
+    async def list_projects(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        summary: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        List a page of projects, newest first
+
+        Pass ``project_cursor()`` of the last project from the previous page as
+        ``cursor`` to page by key instead of by offset. INTERNAL_FIELDS are always
+        omitted, and with ``summary`` so are the HEAVY_PROJECT_FIELDS.
+        """
+        order = self._project_order
+        end = bisect.bisect_left(order, self._decode_cursor(cursor)) if cursor is not None else len(order)
+        stop = max(end - skip, 0)
+        start = max(stop - limit, 0)
+        
+        hidden = HEAVY_PROJECT_FIELDS | INTERNAL_FIELDS if summary else INTERNAL_FIELDS
+        projects = []
+        for _, project_id in reversed(order[start:stop]):
+            project = self.projects[project_id]
+            if summary or not hidden.isdisjoint(project):
+                project = {k: v for k, v in project.items() if k not in hidden}
+            projects.append(project)
+        return projects
+    
+    @staticmethod
+    def project_cursor(project: Dict[str, Any]) -> str:
+        """Opaque paging cursor for a project: its (created_at, id) ordering key"""
+        key = orjson.dumps([project.get("created_at", ""), project["id"]])
+        return base64.urlsafe_b64encode(key).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """Ordering key for a cursor from project_cursor(), or a bare created_at from older clients"""
+        try:
+            created_at, project_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+            return (created_at, project_id)
+        except (binascii.Error, ValueError, TypeError):
+            # Without an id, every project at exactly that timestamp falls on this side
+            return (cursor,)
+    
+    async def pending_jobs(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """(collection, id, job) for every project or build with an unfinished background job"""
+        return [
+            (name, record_id, record["job"])
+            for name, records in (("projects", self.projects), ("builds", self.builds))
+            for record_id, record in records.items()
+            if record.get("job")
+        ]
+    
+    async def clear_job(self, name: str, record_id: str):
+        """Remove the finished background job recorded on a project or build"""
+        records = getattr(self, name)
+        record = records.get(record_id)
+        if record is not None and "job" in record:
+            records[record_id] = {k: v for k, v in record.items() if k != "job"}
+            self._mark_dirty(name, record_id)
     
     async def delete_project(self, project_id: str):
         """Delete project"""
-        if project_id in self.projects:
-            del self.projects[project_id]
-            await self._save_projects()
+        project = self.projects.pop(project_id, None)
+        if project is not None:
+            self._unindex_project(project)
+            self._mark_dirty("projects", project_id)
             logger.info(f"Deleted project {project_id}")
     
+    def _unindex_project(self, project: Dict[str, Any]):
+        """Remove a project from the created_at ordering"""
+        key = (project.get("created_at", ""), project["id"])
+        index = bisect.bisect_left(self._project_order, key)
+        if index < len(self._project_order) and self._project_order[index] == key:
+            del self._project_order[index]
+    
     async def create_build(self, data: Dict[str, Any]) -> str:
         """Create a new build"""
-        build_id = str(uuid.uuid4())
+        build_id = self._new_id()
+        now = now_iso()
         
         build = {
             "id": build_id,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             **data
         }
         
         self.builds[build_id] = build
-        await self._save_builds()
+        self._mark_dirty("builds", build_id)
         
         logger.info(f"Created build {build_id}")
         return build_id
@@ -111,24 +257,215 @@ class Database:
     
     async def update_build(self, build_id: str, data: Dict[str, Any]):
         """Update build"""
-        if build_id in self.builds:
-            self.builds[build_id].update(data)
-            self.builds[build_id]["updated_at"] = datetime.utcnow().isoformat()
-            await self._save_builds()
+        build = self.builds.get(build_id)
+        if build is not None:
+            changes = {**data, "updated_at": now_iso()}
+            self.builds[build_id] = {**build, **changes}
+            self._mark_dirty("builds", build_id, changes)
             logger.info(f"Updated build {build_id}")
     
-    async def _save_projects(self):
-        """Save projects to file"""
-        with open(self.projects_file, 'w') as f:
-            json.dump(self.projects, f, indent=2)
+    def _load(self, snapshot_file: Path, log_file: Path) -> Tuple[Dict[str, Any], int]:
+        """Load a collection snapshot and replay its log on top, returning the records and snapshot generation"""
+        records = {}
+        generation = 0
+        if snapshot_file.exists():
+            snapshot = orjson.loads(snapshot_file.read_bytes())
+            if "records" in snapshot and "gen" in snapshot:
+                records, generation = snapshot["records"], snapshot["gen"]
+            else:
+                # Snapshots written before generations were tracked
+                records = snapshot
+        
+        if log_file.exists():
+            # Entries ahead of any marker predate generations
+            log_generation = 0
+            with open(log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # A crash can leave a torn final line; everything before it is intact
+                        logger.warning(f"Ignoring truncated entry at end of {log_file.name}")
+                        break
+                    
+                    if entry["op"] == "gen":
+                        log_generation = entry["gen"]
+                        continue
+                    if log_generation < generation:
+                        # Left over from before the snapshot, which already contains it
+                        continue
+                    
+                    if entry["op"] == "put":
+                        records[entry["id"]] = entry["doc"]
+                    elif entry["op"] == "patch":
+                        if entry["id"] in records:
+                            records[entry["id"]].update(entry["fields"])
+                    elif entry["op"] == "del":
+                        records.pop(entry["id"], None)
+            
+            if log_generation < generation:
+                # Fully covered by the snapshot; start over so new entries get a current marker
+                log_file.unlink()
+        
+        return records, generation
+    
+    def _mark_dirty(self, name: str, record_id: str, fields: Optional[Dict[str, Any]] = None):
+        """
+        Queue a changed record for the next background flush
+
+        With ``fields`` only those fields are logged (merged with any patch already
+        queued); otherwise the whole record is written, or deleted if it is gone.
+        """
+        pending = self._pending[name]
+        if fields is None or (record_id in pending and pending[record_id] is None):
+            pending[record_id] = None
+        else:
+            pending.setdefault(record_id, {}).update(fields)
+        self._encoded[name].pop(record_id, None)
+        self._dirty.set()
+    
+    async def _flush_loop(self):
+        """Write queued changes in batches, at most once per FLUSH_DELAY"""
+        while not self._closing:
+            await self._dirty.wait()
+            if self._closing:
+                return
+            await asyncio.sleep(FLUSH_DELAY)
+            self._dirty.clear()
+            await self._flush()
+    
+    async def _flush(self):
+        """Append every queued change to its collection log"""
+        for name, pending in self._pending.items():
+            if not pending:
+                continue
+            self._pending[name] = {}
+            try:
+                await self._flush_collection(name, pending)
+            except Exception as e:
+                # Re-queue as whole-record writes so the next flush retries from current state
+                for record_id in pending:
+                    self._pending[name][record_id] = None
+                self._dirty.set()
+                logger.error(f"Database flush of {name} failed: {str(e)}")
+    
+    async def _flush_collection(self, name: str, pending: Dict[str, Optional[Dict[str, Any]]]):
+        """Log one collection's batch of changes, or compact it if the log would grow too large"""
+        records = getattr(self, name)
+        lines = []
+        for record_id, fields in pending.items():
+            doc = records.get(record_id)
+            if doc is None:
+                lines.append(orjson.dumps({"op": "del", "id": record_id}, option=orjson.OPT_APPEND_NEWLINE))
+            elif fields is not None:
+                lines.append(orjson.dumps({"op": "patch", "id": record_id, "fields": fields}, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                lines.append(b'{"op":"put","id":%b,"doc":%b}\n' % (orjson.dumps(record_id), self._encode(name, record_id, doc)))
+        data = b"".join(lines)
+        
+        log = self._log(name)
+        if self._log_sizes[name] + len(data) > LOG_COMPACT_BYTES:
+            # The snapshot already contains these changes
+            await self._compact(name)
+            return
+        
+        await asyncio.to_thread(self._write_log, log, data, self._log_sizes[name])
+        self._log_sizes[name] += len(data)
+    
+    def _encode(self, name: str, record_id: str, doc: Dict[str, Any]) -> bytes:
+        """Get the JSON encoding of a record, serializing it only if it changed"""
+        encoded = self._encoded[name].get(record_id)
+        if encoded is None:
+            encoded = self._encoded[name][record_id] = orjson.dumps(doc)
+        return encoded
+    
+    @staticmethod
+    def _write_log(log, data: bytes, size: int):
+        """Append a batch of encoded entries to an open log that is ``size`` bytes long"""
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[log.write(view):]
+        except Exception:
+            # Cut off any partial entry; replay stops at the first torn line, so
+            # anything appended after it would be lost
+            os.ftruncate(log.fileno(), size)
+            raise
+    
+    def _log(self, name: str):
+        """Get the append handle for a collection log, opening it on first use"""
+        log = self._logs.get(name)
+        if log is None:
+            log_file = self.db_dir / f"{name}.log"
+            # Unbuffered, so a failed append can be rolled back with ftruncate
+            log = self._logs[name] = open(log_file, 'ab', buffering=0)
+            if log_file.stat().st_size == 0:
+                self._start_log(log, self._generations[name])
+            self._log_sizes[name] = log_file.stat().st_size
+        return log
+    
+    @staticmethod
+    def _start_log(log, generation: int):
+        """Write a fresh log's generation marker and make it durable"""
+        log.write(orjson.dumps({"op": "gen", "gen": generation}, option=orjson.OPT_APPEND_NEWLINE))
+        os.fsync(log.fileno())
     
-    async def _save_builds(self):
-        """Save builds to file"""
-        with open(self.builds_file, 'w') as f:
-            json.dump(self.builds, f, indent=2)
+    async def _compact(self, name: str):
+        """Write a fresh snapshot of a collection and truncate its log"""
+        # Assemble on the event loop so the collection can't change mid-serialization;
+        # unchanged records reuse their cached encoding
+        generation = self._generations[name] + 1
+        payload = b'{"gen":%d,"records":{%b}}' % (generation, b",".join(
+            b"%b:%b" % (orjson.dumps(record_id), self._encode(name, record_id, doc))
+            for record_id, doc in getattr(self, name).items()
+        ))
+        await asyncio.to_thread(self._write_snapshot, name, payload, generation)
+        self._generations[name] = generation
+        self._log_sizes[name] = self._log(name).tell()
+        
+        logger.info(f"Compacted {name} snapshot")
+    
+    def _write_snapshot(self, name: str, payload: bytes, generation: int):
+        """Replace a collection snapshot and restart its log at the snapshot's generation"""
+        snapshot_file = self.db_dir / f"{name}.json"
+        tmp_file = snapshot_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers see either the old snapshot or the new one, never a torn file
+        os.replace(tmp_file, snapshot_file)
+        
+        # Persist the rename itself before the log it supersedes is truncated
+        dir_fd = os.open(self.db_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        
+        # Until this marker is durable the old log still carries an older generation,
+        # so replaying it over the new snapshot is skipped
+        log = self._logs.get(name)
+        if log is None:
+            log = self._logs[name] = open(self.db_dir / f"{name}.log", 'ab', buffering=0)
+        log.seek(0)
+        log.truncate()
+        self._start_log(log, generation)
     
     async def close(self):
         """Close database connections"""
         logger.info("Closing database...")
-        await self._save_projects()
-        await self._save_builds()
+        if self._flush_task is not None:
+            # Let an in-flight flush finish so its thread can't write after the final snapshot
+            self._closing = True
+            self._dirty.set()
+            await self._flush_task
+            self._flush_task = None
+        
+        # A final snapshot covers anything still waiting to be flushed
+        for name in self._pending:
+            self._pending[name] = {}
+            await self._compact(name)
+        for log in self._logs.values():
+            log.close()
+        self._logs.clear()
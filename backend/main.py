@@ -10,16 +10,23 @@ This is the core backend server that orchestrates:
 - Voice assistant integration
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse, Response
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 import os
+import sys
 import json
+import uuid
+import orjson
 import asyncio
-from datetime import datetime
+import aiofiles
+import concurrent.futures
+from contextlib import asynccontextmanager
 import logging
+import logging.handlers
+import queue
 
 # Import our custom modules
 from services.github_service import GitHubService
@@ -28,17 +35,31 @@ from services.code_generator import CodeGenerator
 from services.build_service import BuildService
 from services.voice_service import VoiceService
 from services.deep_mode import DeepMode
-from database.db import Database
+from database.db import Database, now_iso
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: callers only enqueue records, a listener thread does the writing
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(), respect_handler_level=True)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+log_listener.start()
 logger = logging.getLogger(__name__)
 
+UPLOAD_DIR = "/tmp/my_uploads"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Largest page list_projects will return
+MAX_PAGE_SIZE = 100
+
+# Platforms whose output others consume build first; unlisted ones go last
+BUILD_ORDER = {"web": 0, "desktop": 1, "android": 2, "ios": 3}
+
 # Initialize FastAPI app
 app = FastAPI(
     title="My - Universal AI App Generator",
     description="Free, open-source AI platform for generating real, working apps",
-    version="1.0.0"
+    version="1.0.0",
+    # Plans, analyses and generated code make for large responses; orjson encodes them much faster
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - allow all origins for development
@@ -59,6 +80,57 @@ build_service = BuildService()
 voice_service = VoiceService()
 deep_mode = DeepMode()
 
+def _init_analysis_worker():
+    """Log straight to stderr in pool workers; the parent's queue listener doesn't run there"""
+    logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()], force=True)
+
+# Repo analysis walks and parses whole trees in pure Python; run it in worker processes so it
+# doesn't hold the GIL against request handling. Platforms without working multiprocessing
+# primitives (e.g. Termux) fall back to threads.
+try:
+    analysis_executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        initializer=_init_analysis_worker
+    )
+except (ImportError, NotImplementedError, OSError):
+    analysis_executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+
+class JobLimiter:
+    """Caps how many background jobs run at once and counts the ones queued behind them"""
+    
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self.running = 0
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(max_jobs)
+    
+    @asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._sem.release()
+
+# Clones, analyses, generations and builds are heavy on disk, CPU and the AI backends;
+# past MAX_JOBS they queue instead of all competing at once
+job_limiter = JobLimiter(int(os.getenv("MAX_JOBS", 4)))
+
+# Deep Mode progress is saved on every tick (pollers read it from the project)
+# and also pushed to SSE subscribers
+progress_subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+def _publish_progress(project_id: str, event: Optional[Dict[str, Any]]):
+    """Push a progress event to every stream watching the project (None ends the streams)"""
+    for queue in progress_subscribers.get(project_id, ()):
+        queue.put_nowait(event)
+
 # Pydantic models for request/response
 class GitHubRepoRequest(BaseModel):
     repo_url: HttpUrl
@@ -73,10 +145,22 @@ class TextPromptRequest(BaseModel):
     source_project_id: Optional[str] = None  # Project ID from repo analysis
     app_complexity: Optional[str] = "standard"  # basic, standard, advanced
 
+class AnalysisPayload(BaseModel):
+    """Shape of GitHubService.analyze_repo() results"""
+    total_files: int = 0
+    total_lines: int = 0
+    file_types: Dict[str, int] = {}
+    languages: Dict[str, int] = {}
+    directory_structure: Dict[str, Any] = {}
+    entry_points: List[str] = []
+    config_files: List[str] = []
+    test_files: List[str] = []
+    documentation: List[str] = []
+
 class ProjectAnalysisResponse(BaseModel):
     project_id: str
     status: str
-    analysis: Optional[Dict[str, Any]] = None
+    analysis: Optional[AnalysisPayload] = None
     tech_stack: Optional[List[str]] = None
     dependencies: Optional[Dict[str, List[str]]] = None
     structure: Optional[Dict[str, Any]] = None
@@ -90,41 +174,49 @@ class VoiceCommandRequest(BaseModel):
     audio_data: Optional[str] = None  # base64 encoded audio
     text: Optional[str] = None  # or direct text command
 
-# Root endpoint
+# Root endpoint (static, so encode it once)
+ROOT_RESPONSE = orjson.dumps({
+    "app": "My - Universal AI App Generator",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "health": "/health",
+        "analyze_github": "/api/v1/analyze/github",
+        "analyze_upload": "/api/v1/analyze/upload",
+        "generate_from_prompt": "/api/v1/generate/prompt",
+        "build_app": "/api/v1/build",
+        "voice_command": "/api/v1/voice/command",
+        "list_models": "/api/v1/models/list",
+        "projects": "/api/v1/projects"
+    }
+})
+
 @app.get("/")
 async def root():
-    return {
-        "app": "My - Universal AI App Generator",
-        "version": "1.0.0",
-        "status": "running",
-        "endpoints": {
-            "health": "/health",
-            "analyze_github": "/api/v1/analyze/github",
-            "analyze_upload": "/api/v1/analyze/upload",
-            "generate_from_prompt": "/api/v1/generate/prompt",
-            "build_app": "/api/v1/build",
-            "voice_command": "/api/v1/voice/command",
-            "list_models": "/api/v1/models/list",
-            "projects": "/api/v1/projects"
-        }
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    database_ok, ai_models_ok = await asyncio.gather(db.health_check(), ai_orchestrator.health_check())
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now_iso(),
         "services": {
-            "database": await db.health_check(),
-            "ai_models": await ai_orchestrator.health_check(),
+            "database": database_ok,
+            "ai_models": ai_models_ok,
             "github": github_service.is_configured(),
             "voice": voice_service.is_available()
+        },
+        "jobs": {
+            "running": job_limiter.running,
+            "queued": job_limiter.waiting,
+            "max": job_limiter.max_jobs
         }
     }
 
 @app.post("/api/v1/analyze/github", response_model=ProjectAnalysisResponse)
-async def analyze_github_repo(request: GitHubRepoRequest, background_tasks: BackgroundTasks):
+async def analyze_github_repo(request: GitHubRepoRequest):
     """
     Analyze a GitHub repository and prepare for app generation
     
@@ -146,8 +238,10 @@ async def analyze_github_repo(request: GitHubRepoRequest, background_tasks: Back
         })
         
         # Start analysis in background
-        background_tasks.add_task(
-            _analyze_github_background,
+        await job_queue.enqueue(
+            "projects",
+            project_id,
+            "analyze_github",
             project_id,
             str(request.repo_url),
             request.branch,
@@ -167,29 +261,24 @@ async def analyze_github_repo(request: GitHubRepoRequest, background_tasks: Back
 async def _analyze_github_background(project_id: str, repo_url: str, branch: str, include_analysis: bool):
     """Background task for GitHub repo analysis"""
     try:
-        # Clone repository
-        repo_path = await github_service.clone_repo(repo_url, branch)
-        
-        # Analyze code structure
-        analysis = await github_service.analyze_repo(repo_path)
-        
-        # Detect tech stack
-        tech_stack = await github_service.detect_tech_stack(repo_path)
-        
-        # Get dependencies
-        dependencies = await github_service.extract_dependencies(repo_path)
-        
-        # Update project with analysis results
-        await db.update_project(project_id, {
-            "status": "analyzed",
-            "repo_path": repo_path,
-            "analysis": analysis,
-            "tech_stack": tech_stack,
-            "dependencies": dependencies,
-            "analyzed_at": datetime.utcnow().isoformat()
-        })
-        
-        logger.info(f"Analysis complete for project {project_id}")
+        async with job_limiter.slot():
+            # Clone repository
+            repo_path = await github_service.clone_repo(repo_url, branch)
+            
+            # Analyze code structure, detect tech stack and get dependencies
+            analysis, tech_stack, dependencies = await _analyze_path(repo_path)
+            
+            # Update project with analysis results
+            await db.update_project(project_id, {
+                "status": "analyzed",
+                "repo_path": repo_path,
+                "analysis": analysis,
+                "tech_stack": tech_stack,
+                "dependencies": dependencies,
+                "analyzed_at": now_iso()
+            })
+            
+            logger.info(f"Analysis complete for project {project_id}")
         
     except Exception as e:
         logger.error(f"Background analysis failed: {str(e)}")
@@ -198,10 +287,18 @@ async def _analyze_github_background(project_id: str, repo_url: str, branch: str
             "error": str(e)
         })
 
+async def _analyze_path(path: str):
+    """Run the three independent repo analyses concurrently in the analysis executor"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        loop.run_in_executor(analysis_executor, GitHubService.analyze_repo_sync, path),
+        loop.run_in_executor(analysis_executor, GitHubService.detect_tech_stack_sync, path),
+        loop.run_in_executor(analysis_executor, GitHubService.extract_dependencies_sync, path)
+    )
+
 @app.post("/api/v1/analyze/upload")
 async def analyze_uploaded_project(
-    file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None
+    file: UploadFile = File(...)
 ):
     """
     Analyze an uploaded project file (ZIP or folder)
@@ -210,12 +307,18 @@ async def analyze_uploaded_project(
         logger.info(f"Analyzing uploaded file: {file.filename}")
         
         # Save uploaded file
-        upload_path = f"/tmp/my_uploads/{datetime.utcnow().timestamp()}_{file.filename}"
-        os.makedirs(os.path.dirname(upload_path), exist_ok=True)
+        # Random prefix so concurrent uploads of the same name never collide; basename keeps
+        # the client-supplied name from escaping the upload dir
+        upload_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4().hex}_{os.path.basename(file.filename or 'upload')}")
         
-        with open(upload_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        if sys.platform == "linux" and getattr(file.file, "_rolled", False):
+            # Starlette already spooled a large upload to a temp file; copy it kernel-side
+            await asyncio.to_thread(_sendfile_copy, file.file, upload_path)
+        else:
+            # Stream to disk in chunks so large uploads don't block the loop or sit in memory
+            async with aiofiles.open(upload_path, "wb") as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
         
         # Create project entry
         project_id = await db.create_project({
@@ -226,8 +329,10 @@ async def analyze_uploaded_project(
         })
         
         # Extract and analyze
-        background_tasks.add_task(
-            _analyze_upload_background,
+        await job_queue.enqueue(
+            "projects",
+            project_id,
+            "analyze_upload",
             project_id,
             upload_path
         )
@@ -242,33 +347,45 @@ async def analyze_uploaded_project(
         logger.error(f"Error analyzing upload: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sendfile_copy(src, dst_path: str):
+    """Copy an on-disk spooled upload to dst_path with os.sendfile, skipping userspace buffers"""
+    src.flush()
+    src_fd = src.fileno()
+    size = os.fstat(src_fd).st_size
+    with open(dst_path, "wb") as dst:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
 async def _analyze_upload_background(project_id: str, upload_path: str):
     """Background task for uploaded file analysis"""
     try:
-        # Extract if ZIP
-        extracted_path = await github_service.extract_archive(upload_path)
-        
-        # Analyze
-        analysis = await github_service.analyze_repo(extracted_path)
-        tech_stack = await github_service.detect_tech_stack(extracted_path)
-        dependencies = await github_service.extract_dependencies(extracted_path)
-        
-        # Update project
-        await db.update_project(project_id, {
-            "status": "analyzed",
-            "repo_path": extracted_path,
-            "analysis": analysis,
-            "tech_stack": tech_stack,
-            "dependencies": dependencies,
-            "analyzed_at": datetime.utcnow().isoformat()
-        })
+        async with job_limiter.slot():
+            # Extract if ZIP
+            extracted_path = await github_service.extract_archive(upload_path)
+            
+            # Analyze
+            analysis, tech_stack, dependencies = await _analyze_path(extracted_path)
+            
+            # Update project
+            await db.update_project(project_id, {
+                "status": "analyzed",
+                "repo_path": extracted_path,
+                "analysis": analysis,
+                "tech_stack": tech_stack,
+                "dependencies": dependencies,
+                "analyzed_at": now_iso()
+            })
         
     except Exception as e:
         logger.error(f"Upload analysis failed: {str(e)}")
         await db.update_project(project_id, {"status": "error", "error": str(e)})
 
 @app.post("/api/v1/generate/prompt")
-async def generate_from_prompt(request: TextPromptRequest, background_tasks: BackgroundTasks):
+async def generate_from_prompt(request: TextPromptRequest):
     """
     Generate a complete app from a text prompt
     
@@ -287,8 +404,10 @@ async def generate_from_prompt(request: TextPromptRequest, background_tasks: Bac
         })
         
         # Start generation in background
-        background_tasks.add_task(
-            _generate_from_prompt_background,
+        await job_queue.enqueue(
+            "projects",
+            project_id,
+            "generate_from_prompt",
             project_id,
             request.prompt,
             request.app_type,
@@ -313,42 +432,52 @@ async def _generate_from_prompt_background(
 ):
     """Background task for prompt-based app generation"""
     try:
-        # Use AI orchestrator to plan the app
-        plan = await ai_orchestrator.create_app_plan(prompt, app_type, platforms)
-        
-        await db.update_project(project_id, {
-            "status": "planned",
-            "plan": plan
-        })
-        
-        # Generate code using multiple AI models
-        generated_code = await code_generator.generate_full_app(plan)
-        
-        await db.update_project(project_id, {
-            "status": "generated",
-            "code": generated_code
-        })
-        
-        # Create project structure
-        project_path = await code_generator.create_project_structure(
-            project_id,
-            generated_code
-        )
-        
-        await db.update_project(project_id, {
-            "status": "ready",
-            "repo_path": project_path,
-            "generated_at": datetime.utcnow().isoformat()
-        })
-        
-        logger.info(f"Generation complete for project {project_id}")
+        async with job_limiter.slot():
+            # Use AI orchestrator to plan the app
+            plan = await ai_orchestrator.create_app_plan(prompt, app_type, platforms)
+            
+            await db.update_project(project_id, {
+                "status": "planned",
+                "plan": plan
+            })
+            
+            # Generate code using multiple AI models
+            generated_code = await code_generator.generate_full_app(plan)
+            
+            await db.update_project(project_id, {
+                "status": "generated",
+                "code": generated_code
+            })
+            
+            # Create project structure
+            project_path = await code_generator.create_project_structure(
+                project_id,
+                generated_code
+            )
+            
+            await db.update_project(project_id, {
+                "status": "ready",
+                "repo_path": project_path,
+                "generated_at": now_iso()
+            })
+            
+            logger.info(f"Generation complete for project {project_id}")
         
     except Exception as e:
         logger.error(f"Generation failed: {str(e)}")
         await db.update_project(project_id, {"status": "error", "error": str(e)})
 
+DEEP_MODE_FEATURES = (
+    "File-by-file generation with validation",
+    "Advanced error checking",
+    "Comprehensive testing",
+    "Performance optimization",
+    "Security audits",
+    "Complete documentation"
+)
+
 @app.post("/api/v1/generate/deep-mode")
-async def generate_deep_mode(request: TextPromptRequest, background_tasks: BackgroundTasks):
+async def generate_deep_mode(request: TextPromptRequest):
     """
     🚀 DEEP MODE - Ultra Advanced App Generation
     
@@ -380,8 +509,10 @@ async def generate_deep_mode(request: TextPromptRequest, background_tasks: Backg
         })
         
         # Start Deep Mode generation
-        background_tasks.add_task(
-            _generate_deep_mode_background,
+        await job_queue.enqueue(
+            "projects",
+            project_id,
+            "generate_deep_mode",
             project_id,
             request.prompt,
             request.app_type,
@@ -394,14 +525,7 @@ async def generate_deep_mode(request: TextPromptRequest, background_tasks: Backg
             "status": "initializing",
             "message": "🚀 Deep Mode activated! AI is creating your production-ready app with extreme precision. This will take 10-20 minutes for maximum quality.",
             "estimated_time": "10-20 minutes",
-            "features": [
-                "File-by-file generation with validation",
-                "Advanced error checking",
-                "Comprehensive testing",
-                "Performance optimization",
-                "Security audits",
-                "Complete documentation"
-            ]
+            "features": DEEP_MODE_FEATURES
         }
     
     except Exception as e:
@@ -416,41 +540,48 @@ async def _generate_deep_mode_background(
 ):
     """Background task for Deep Mode generation"""
     try:
-        # Progress callback
-        async def update_progress(progress_data: Dict[str, Any]):
+        async with job_limiter.slot():
+            # Progress callback
+            async def update_progress(progress_data: Dict[str, Any]):
+                # Deep Mode keeps mutating its stats dict, so hand out a copy
+                progress = {
+                    "progress": progress_data["progress"],
+                    "progress_message": progress_data["message"],
+                    "stats": dict(progress_data["stats"])
+                }
+                # In-memory update; the store coalesces the writes itself
+                await db.update_project(project_id, progress)
+                _publish_progress(project_id, progress)
+            
+            # Create plan
+            plan = await ai_orchestrator.create_app_plan(prompt, app_type, platforms)
+            
             await db.update_project(project_id, {
-                "progress": progress_data["progress"],
-                "progress_message": progress_data["message"],
-                "stats": progress_data["stats"]
+                "status": "planning_complete",
+                "plan": plan
             })
-        
-        # Create plan
-        plan = await ai_orchestrator.create_app_plan(prompt, app_type, platforms)
-        
-        await db.update_project(project_id, {
-            "status": "planning_complete",
-            "plan": plan
-        })
-        
-        # Generate with Deep Mode
-        result = await deep_mode.generate_app_deep_mode(
-            plan,
-            project_id,
-            progress_callback=update_progress
-        )
-        
-        # Save results
-        await db.update_project(project_id, {
-            "status": "completed",
-            "project": result["project"],
-            "stats": result["stats"],
-            "quality_score": result["quality_score"],
-            "time_taken": result["time_taken"],
-            "completed_at": datetime.utcnow().isoformat()
-        })
-        
-        logger.info(f"✅ Deep Mode completed for project {project_id}")
-        logger.info(f"Quality Score: {result['quality_score']:.2f}/100")
+            
+            # Generate with Deep Mode
+            result = await deep_mode.generate_app_deep_mode(
+                plan,
+                project_id,
+                progress_callback=update_progress
+            )
+            
+            # Save results
+            await db.update_project(project_id, {
+                "status": "completed",
+                "project": result["project"],
+                "stats": dict(result["stats"]),
+                "quality_score": result["quality_score"],
+                "time_taken": result["time_taken"],
+                "completed_at": now_iso()
+            })
+            
+            _publish_progress(project_id, {"status": "completed", "quality_score": result["quality_score"]})
+            
+            logger.info(f"✅ Deep Mode completed for project {project_id}")
+            logger.info(f"Quality Score: {result['quality_score']:.2f}/100")
         
     except Exception as e:
         logger.error(f"Deep Mode failed: {str(e)}")
@@ -458,9 +589,12 @@ async def _generate_deep_mode_background(
             "status": "error",
             "error": str(e)
         })
+        _publish_progress(project_id, {"status": "error", "error": str(e)})
+    finally:
+        _publish_progress(project_id, None)
 
 @app.post("/api/v1/build")
-async def build_app(request: BuildRequest, background_tasks: BackgroundTasks):
+async def build_app(request: BuildRequest):
     """
     Build app for specified platforms (Android, iOS, Web, Desktop)
     """
@@ -478,8 +612,10 @@ async def build_app(request: BuildRequest, background_tasks: BackgroundTasks):
             "status": "building"
         })
         
-        background_tasks.add_task(
-            _build_app_background,
+        await job_queue.enqueue(
+            "builds",
+            build_id,
+            "build_app",
             build_id,
             request.project_id,
             request.platforms,
@@ -504,30 +640,35 @@ async def _build_app_background(
 ):
     """Background task for app building"""
     try:
-        project = await db.get_project(project_id)
-        
-        build_results = {}
-        for platform in platforms:
-            logger.info(f"Building for platform: {platform}")
+        async with job_limiter.slot():
+            project = await db.get_project(project_id)
+            builders = {
+                "web": build_service.build_web,
+                "android": build_service.build_android,
+                "ios": build_service.build_ios,
+                "desktop": build_service.build_desktop
+            }
             
-            if platform == "web":
-                result = await build_service.build_web(project["repo_path"], options)
-            elif platform == "android":
-                result = await build_service.build_android(project["repo_path"], options)
-            elif platform == "ios":
-                result = await build_service.build_ios(project["repo_path"], options)
-            elif platform == "desktop":
-                result = await build_service.build_desktop(project["repo_path"], options)
-            else:
-                result = {"status": "unsupported", "platform": platform}
+            # Builds share the project directory and feed each other: the web build produces the
+            # assets Capacitor syncs, and web/desktop may run npm in the same root. So run them
+            # one at a time, web and desktop before the mobile syncs.
+            build_results = dict.fromkeys(platforms)
+            for platform in sorted(build_results, key=lambda p: BUILD_ORDER.get(p, len(BUILD_ORDER))):
+                if platform not in builders:
+                    build_results[platform] = {"status": "unsupported", "platform": platform}
+                    continue
+                
+                logger.info(f"Building for platform: {platform}")
+                try:
+                    build_results[platform] = await builders[platform](project["repo_path"], options)
+                except Exception as e:
+                    build_results[platform] = {"status": "error", "platform": platform, "error": str(e)}
             
-            build_results[platform] = result
-        
-        await db.update_build(build_id, {
-            "status": "completed",
-            "results": build_results,
-            "completed_at": datetime.utcnow().isoformat()
-        })
+            await db.update_build(build_id, {
+                "status": "completed",
+                "results": build_results,
+                "completed_at": now_iso()
+            })
         
     except Exception as e:
         logger.error(f"Build failed: {str(e)}")
@@ -570,6 +711,7 @@ async def list_available_models():
     List all available AI models (local and cloud)
     """
     try:
+        # The orchestrator caches the listing until its model inventory changes
         models = await ai_orchestrator.list_models()
         return {
             "models": models,
@@ -582,15 +724,23 @@ async def list_available_models():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/projects")
-async def list_projects(skip: int = 0, limit: int = 20):
+async def list_projects(skip: int = 0, limit: int = 20, cursor: Optional[str] = None, full: bool = False):
     """
     List all projects
+
+    Use ``next_cursor`` from the response as ``cursor`` to fetch the next page.
+    At most MAX_PAGE_SIZE projects are returned per page.
+    Large fields (analysis, plan, generated code) are only included with ``full=true``;
+    otherwise fetch them per project.
     """
     try:
-        projects = await db.list_projects(skip, limit)
+        limit = min(limit, MAX_PAGE_SIZE)
+        projects = await db.list_projects(skip, limit, cursor, summary=not full)
+        next_cursor = db.project_cursor(projects[-1]) if projects and len(projects) == limit else None
         return {
             "projects": projects,
-            "count": len(projects)
+            "count": len(projects),
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"Error listing projects: {str(e)}")
@@ -602,16 +752,55 @@ async def get_project(project_id: str):
     Get project details
     """
     try:
-        project = await db.get_project(project_id)
-        if not project:
+        # Status polling hits this constantly; serve the cached encoding
+        project = await db.get_project_serialized(project_id)
+        if project is None:
             raise HTTPException(status_code=404, detail="Project not found")
-        return project
+        return Response(content=project, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting project: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/v1/projects/{project_id}/stream")
+async def stream_project_progress(project_id: str):
+    """
+    Stream Deep Mode progress as Server-Sent Events
+    
+    The first event is the project's current state; the stream ends once
+    generation completes or fails.
+    """
+    if await db.get_project(project_id) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return StreamingResponse(_progress_events(project_id), media_type="text/event-stream")
+
+async def _progress_events(project_id: str):
+    """Yield SSE frames for a project until its Deep Mode run finishes"""
+    queue: asyncio.Queue = asyncio.Queue()
+    progress_subscribers.setdefault(project_id, set()).add(queue)
+    try:
+        project = await db.get_project(project_id)
+        if project is None:
+            return
+        yield b"data: %b\n\n" % orjson.dumps({
+            "status": project.get("status"),
+            "progress": project.get("progress"),
+            "progress_message": project.get("progress_message"),
+            "stats": project.get("stats")
+        })
+        if project.get("mode") != "deep" or project.get("status") in ("completed", "error"):
+            return
+        
+        while (event := await queue.get()) is not None:
+            yield b"data: %b\n\n" % orjson.dumps(event)
+    finally:
+        subscribers = progress_subscribers.get(project_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del progress_subscribers[project_id]
+
 @app.delete("/api/v1/projects/{project_id}")
 async def delete_project(project_id: str):
     """
@@ -624,28 +813,102 @@ async def delete_project(project_id: str):
         logger.error(f"Error deleting project: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+class JobQueue:
+    """
+    Runs background jobs as tasks and records each one on its project or build
+    
+    A job stays recorded until its handler returns, so jobs cut off by a restart
+    are picked up again by resume() on the next startup.
+    """
+    
+    def __init__(self, handlers: Dict[str, Any]):
+        self.handlers = handlers
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def enqueue(self, collection: str, record_id: str, name: str, *args):
+        job = {"name": name, "args": list(args)}
+        await self._update(collection, record_id, {"job": job})
+        self._start(collection, record_id, job)
+    
+    async def resume(self):
+        for collection, record_id, job in await db.pending_jobs():
+            logger.info(f"Resuming {job['name']} job for {record_id}")
+            self._start(collection, record_id, job)
+    
+    async def cancel_all(self):
+        """Stop running jobs, leaving them recorded so they resume on the next start"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _start(self, collection: str, record_id: str, job: Dict[str, Any]):
+        task = asyncio.create_task(self._run(collection, record_id, job))
+        # The loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, collection: str, record_id: str, job: Dict[str, Any]):
+        handler = self.handlers.get(job["name"])
+        if handler is None:
+            # e.g. recorded by a version with a job type this one doesn't have
+            logger.error(f"Dropping unknown {job['name']} job for {record_id}")
+        else:
+            await handler(*job["args"])
+        await db.clear_job(collection, record_id)
+    
+    @staticmethod
+    async def _update(collection: str, record_id: str, data: Dict[str, Any]):
+        if collection == "builds":
+            await db.update_build(record_id, data)
+        else:
+            await db.update_project(record_id, data)
+
+job_queue = JobQueue({
+    "analyze_github": _analyze_github_background,
+    "analyze_upload": _analyze_upload_background,
+    "generate_from_prompt": _generate_from_prompt_background,
+    "generate_deep_mode": _generate_deep_mode_background,
+    "build_app": _build_app_background
+})
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
     logger.info("🚀 Starting My - Universal AI App Generator")
-    await db.initialize()
-    await ai_orchestrator.initialize()
+    await asyncio.to_thread(os.makedirs, UPLOAD_DIR, exist_ok=True)
+    # The database and AI model detection don't depend on each other
+    services = ("database", "AI orchestrator")
+    results = await asyncio.gather(db.initialize(), ai_orchestrator.initialize(), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for name, result in zip(services, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to initialize {name}: {str(result)}")
+    if errors:
+        raise errors[0]
+    await job_queue.resume()
     logger.info("✅ All services initialized")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("👋 Shutting down My - Universal AI App Generator")
+    await job_queue.cancel_all()
     await db.close()
     await ai_orchestrator.cleanup()
+    analysis_executor.shutdown(wait=False, cancel_futures=True)
+    log_listener.stop()
 
 if __name__ == "__main__":
     import uvicorn
+    # uvicorn already picks uvloop and httptools when they're installed (uvicorn[standard]);
+    # the Termux fallback install doesn't have them. The project store lives in process
+    # memory and owns its log files, so this must stay a single worker.
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=os.getenv("DEV") == "1",
         log_level="info"
     )
@@ -8,14 +8,170 @@ Coordinates multiple AI models and agents to:
 """
 
 import os
+import re
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
 import json
+import orjson
 from pathlib import Path
 
+try:
+    import aiohttp
+except ImportError:  # only needed to probe Ollama/vLLM
+    aiohttp = None
+
 logger = logging.getLogger(__name__)
 
+# Per-complexity plan settings; shared between plans, so treat as read-only
+COMPLEXITY_CONFIGS = {
+    "basic": {
+        "estimated_time": "2-5 minutes",
+        "features_level": "essential",
+        "testing_coverage": "basic",
+        "optimization_level": "minimal",
+        "security_features": ["basic_auth", "input_validation"],
+        "caching": False,
+        "realtime_features": False,
+        "advanced_db": False,
+        "monitoring": False,
+        "ci_cd": False
+    },
+    "standard": {
+        "estimated_time": "5-10 minutes",
+        "features_level": "complete",
+        "testing_coverage": "comprehensive",
+        "optimization_level": "moderate",
+        "security_features": ["jwt_auth", "input_validation", "rate_limiting", "cors"],
+        "caching": True,
+        "realtime_features": False,
+        "advanced_db": True,
+        "monitoring": True,
+        "ci_cd": False
+    },
+    "advanced": {
+        "estimated_time": "10-20 minutes",
+        "features_level": "enterprise",
+        "testing_coverage": "complete",
+        "optimization_level": "maximum",
+        "security_features": ["jwt_auth", "oauth", "input_validation", "rate_limiting", 
+                             "cors", "encryption", "security_headers", "audit_logs"],
+        "caching": True,
+        "realtime_features": True,
+        "advanced_db": True,
+        "monitoring": True,
+        "ci_cd": True,
+        "elasticsearch": True,
+        "message_queue": True,
+        "microservices": True
+    }
+}
+
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile keywords into one case-insensitive substring alternation"""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+# Services a prompt asks for, keyed by the words that imply them
+SERVICE_PATTERNS = {
+    service: _keyword_pattern(keywords)
+    for service, keywords in {
+        "auth": ["login", "signup", "authentication", "user"],
+        "payment": ["payment", "checkout", "billing", "subscription"],
+        "storage": ["upload", "file", "image", "storage"],
+        "notification": ["notification", "email", "sms", "alert"],
+        "analytics": ["analytics", "tracking", "metrics"],
+        "search": ["search", "find", "query"],
+        "chat": ["chat", "messaging", "conversation"],
+        "realtime": ["realtime", "live", "websocket"]
+    }.items()
+}
+
+# Voice command intents
+CREATE_INTENT = _keyword_pattern(["create", "make", "build", "generate"])
+ANALYZE_INTENT = _keyword_pattern(["analyze", "check", "look at", "examine"])
+BUILD_INTENT = _keyword_pattern(["build"])
+MOBILE_PLATFORM = _keyword_pattern(["android", "ios", "mobile"])
+HELP_INTENT = _keyword_pattern(["help", "what can you do", "how do"])
+
+# Planner building blocks by complexity. Plans get their own copies of these
+# entries so a plan never aliases module state.
+AUTH_FEATURE_BY_COMPLEXITY = {
+    "basic": "Simple User Authentication",
+    "standard": "User Authentication with JWT"
+}
+ADVANCED_AUTH_FEATURE = "Advanced Authentication (JWT + OAuth + 2FA)"
+
+_STANDARD_FEATURES = [
+    {"name": "Error Handling & Logging", "priority": "high"},
+    {"name": "Data Validation", "priority": "medium"},
+    {"name": "Rate Limiting", "priority": "medium"}
+]
+FEATURES_BY_COMPLEXITY = {
+    "standard": _STANDARD_FEATURES,
+    "advanced": _STANDARD_FEATURES + [
+        {"name": "Real-time Updates (WebSocket)", "priority": "medium"},
+        {"name": "Advanced Search (Elasticsearch)", "priority": "medium"},
+        {"name": "Caching Layer (Redis)", "priority": "medium"},
+        {"name": "Background Jobs (Celery)", "priority": "medium"},
+        {"name": "Monitoring & Analytics", "priority": "low"},
+        {"name": "CI/CD Pipeline", "priority": "low"}
+    ]
+}
+
+_BASE_USER_COLUMNS = [
+    {"name": "id", "type": "uuid", "primary_key": True},
+    {"name": "email", "type": "string", "unique": True},
+    {"name": "created_at", "type": "timestamp"}
+]
+_STANDARD_USER_COLUMNS = _BASE_USER_COLUMNS + [
+    {"name": "updated_at", "type": "timestamp"},
+    {"name": "last_login", "type": "timestamp"},
+    {"name": "is_active", "type": "boolean"}
+]
+USER_COLUMNS_BY_COMPLEXITY = {
+    "standard": _STANDARD_USER_COLUMNS,
+    "advanced": _STANDARD_USER_COLUMNS + [
+        {"name": "roles", "type": "array"},
+        {"name": "permissions", "type": "json"},
+        {"name": "metadata", "type": "json"}
+    ]
+}
+AUDIT_LOG_COLUMNS = [
+    {"name": "id", "type": "uuid", "primary_key": True},
+    {"name": "user_id", "type": "uuid", "foreign_key": "users.id"},
+    {"name": "action", "type": "string"},
+    {"name": "timestamp", "type": "timestamp"},
+    {"name": "metadata", "type": "json"}
+]
+
+_BASE_API_ENDPOINTS = [
+    {"method": "GET", "path": "/api/health", "description": "Health check"},
+    {"method": "GET", "path": "/api/v1/items", "description": "List items"},
+    {"method": "POST", "path": "/api/v1/items", "description": "Create item"},
+    {"method": "GET", "path": "/api/v1/items/{id}", "description": "Get item"},
+    {"method": "PUT", "path": "/api/v1/items/{id}", "description": "Update item"},
+    {"method": "DELETE", "path": "/api/v1/items/{id}", "description": "Delete item"}
+]
+_STANDARD_API_ENDPOINTS = _BASE_API_ENDPOINTS + [
+    {"method": "GET", "path": "/api/v1/items/search", "description": "Search items"},
+    {"method": "POST", "path": "/api/v1/items/bulk", "description": "Bulk create"},
+    {"method": "GET", "path": "/api/v1/stats", "description": "Get statistics"}
+]
+API_ENDPOINTS_BY_COMPLEXITY = {
+    "standard": _STANDARD_API_ENDPOINTS,
+    "advanced": _STANDARD_API_ENDPOINTS + [
+        {"method": "GET", "path": "/api/v1/analytics", "description": "Analytics data"},
+        {"method": "WS", "path": "/ws/realtime", "description": "WebSocket real-time updates"},
+        {"method": "GET", "path": "/api/v1/export", "description": "Export data"},
+        {"method": "POST", "path": "/api/v1/import", "description": "Import data"}
+    ]
+}
+
+# App types that get a web frontend / a backend, and platforms that need a mobile toolchain
+WEB_APP_TYPES = frozenset({"full-stack", "web"})
+BACKEND_APP_TYPES = frozenset({"full-stack", "backend", "web"})
+MOBILE_PLATFORMS = frozenset({"android", "ios"})
+
 class AIOrchestrator:
     """
     Central AI orchestration service
@@ -27,11 +183,19 @@ class AIOrchestrator:
         self.cloud_models = {}
         self.agents = {}
         self.config = self._load_config()
+        # Shared HTTP session for backend probes, created on first use
+        self._http = None
+        # Built on first list_models() call; reset whenever the model inventory changes
+        self._models_cache: Optional[List[Dict[str, Any]]] = None
+        # Availability flags read by every /health and models poll
+        self._has_local = False
+        self._has_cloud = False
         
     def _load_config(self) -> Dict[str, Any]:
         """Load AI configuration from environment and config files"""
         config = {
             "models": {
+                # Set any of these to an empty string to skip probing that backend
                 "local": {
                     "ollama_url": os.getenv("OLLAMA_URL", "http://localhost:11434"),
                     "vllm_url": os.getenv("VLLM_URL", "http://localhost:8080"),
@@ -55,63 +219,106 @@ class AIOrchestrator:
         """Initialize AI models and agents"""
         logger.info("Initializing AI Orchestrator...")
         
-        # Try to detect and initialize local models
-        await self._detect_local_models()
-        
-        # Initialize cloud models if configured
-        await self._initialize_cloud_models()
-        
-        # Setup multi-agent framework
-        await self._setup_agents()
+        # Detect local models, initialize configured cloud models and set up the
+        # multi-agent framework; none of them depends on another
+        await asyncio.gather(
+            self._detect_local_models(),
+            self._initialize_cloud_models(),
+            self._setup_agents()
+        )
         
         logger.info(f"AI Orchestrator initialized with {len(self.local_models)} local and {len(self.cloud_models)} cloud models")
     
     async def _detect_local_models(self):
         """Detect available local AI models"""
         try:
-            # Check Ollama
-            ollama_url = self.config["models"]["local"]["ollama_url"]
-            try:
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{ollama_url}/api/tags", timeout=aiohttp.ClientTimeout(total=2)) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            self.local_models["ollama"] = {
-                                "available": True,
-                                "url": ollama_url,
-                                "models": data.get("models", [])
-                            }
-                            logger.info(f"Ollama detected with {len(data.get('models', []))} models")
-            except Exception as e:
-                logger.debug(f"Ollama not available: {str(e)}")
-            
-            # Check for llama.cpp
-            llamacpp_path = Path(self.config["models"]["local"]["llamacpp_path"])
-            if llamacpp_path.exists():
-                self.local_models["llamacpp"] = {
-                    "available": True,
-                    "path": str(llamacpp_path)
-                }
-                logger.info("llama.cpp detected")
-            
-            # Check for vLLM
-            vllm_url = self.config["models"]["local"]["vllm_url"]
-            try:
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f"{vllm_url}/health", timeout=aiohttp.ClientTimeout(total=2)) as resp:
-                        if resp.status == 200:
-                            self.local_models["vllm"] = {
-                                "available": True,
-                                "url": vllm_url
-                            }
-                            logger.info("vLLM detected")
-            except Exception as e:
-                logger.debug(f"vLLM not available: {str(e)}")
+            # The probes are independent, so the slowest one bounds detection time
+            results = await asyncio.gather(
+                self._probe_ollama(),
+                self._probe_llamacpp(),
+                self._probe_vllm(),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error detecting local models: {str(result)}")
+                elif result is not None:
+                    provider, entry = result
+                    self.local_models[provider] = entry
         
         except Exception as e:
             logger.error(f"Error detecting local models: {str(e)}")
+        finally:
+            self.invalidate_models()
+    
+    async def _session(self):
+        """Return the shared aiohttp session, so probes reuse pooled keep-alive connections"""
+        if self._http is None or self._http.closed:
+            # A down backend should fail at connect time, and a burst of probes
+            # can't pile up more than a few sockets per host
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=16,
+                    limit_per_host=4,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=2, connect=1)
+            )
+        return self._http
+    
+    async def _probe_ollama(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Check for a running Ollama server"""
+        ollama_url = self.config["models"]["local"]["ollama_url"]
+        if not ollama_url or aiohttp is None:
+            return None
+        try:
+            session = await self._session()
+            async with session.get(f"{ollama_url}/api/tags") as resp:
+                if resp.status == 200:
+                    data = orjson.loads(await resp.read())
+                    logger.info(f"Ollama detected with {len(data.get('models', []))} models")
+                    return "ollama", {
+                        "available": True,
+                        "url": ollama_url,
+                        # Keep only what the model listing shows, not digests and per-model details
+                        "models": [{"name": model.get("name"), "size": model.get("size")} for model in data.get("models", [])]
+                    }
+        except Exception as e:
+            logger.debug(f"Ollama not available: {str(e)}")
+        return None
+    
+    async def _probe_llamacpp(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Check for a llama.cpp binary"""
+        if not self.config["models"]["local"]["llamacpp_path"]:
+            return None
+        llamacpp_path = Path(self.config["models"]["local"]["llamacpp_path"])
+        if await asyncio.to_thread(llamacpp_path.exists):
+            logger.info("llama.cpp detected")
+            return "llamacpp", {
+                "available": True,
+                "path": str(llamacpp_path)
+            }
+        return None
+    
+    async def _probe_vllm(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Check for a running vLLM server"""
+        vllm_url = self.config["models"]["local"]["vllm_url"]
+        if not vllm_url or aiohttp is None:
+            return None
+        try:
+            session = await self._session()
+            async with session.get(f"{vllm_url}/health") as resp:
+                if resp.status == 200:
+                    logger.info("vLLM detected")
+                    return "vllm", {
+                        "available": True,
+                        "url": vllm_url
+                    }
+        except Exception as e:
+            logger.debug(f"vLLM not available: {str(e)}")
+        return None
     
     async def _initialize_cloud_models(self):
         """Initialize cloud AI model connections"""
@@ -150,6 +357,8 @@ class AIOrchestrator:
         
         except Exception as e:
             logger.error(f"Error initializing cloud models: {str(e)}")
+        finally:
+            self.invalidate_models()
     
     async def _setup_agents(self):
         """Setup multi-agent framework"""
@@ -187,41 +396,38 @@ class AIOrchestrator:
     
     async def health_check(self) -> bool:
         """Check if AI services are available"""
-        return len(self.local_models) > 0 or len(self.cloud_models) > 0
+        return self._has_local or self._has_cloud
     
     def has_local_models(self) -> bool:
         """Check if local models are available"""
-        return len(self.local_models) > 0
+        return self._has_local
     
     def has_cloud_access(self) -> bool:
         """Check if cloud API access is configured"""
-        return len(self.cloud_models) > 0
+        return self._has_cloud
+    
+    def invalidate_models(self):
+        """Refresh the cached model listing and availability flags after local or cloud models change"""
+        self._models_cache = None
+        self._has_local = bool(self.local_models)
+        self._has_cloud = bool(self.cloud_models)
     
     async def list_models(self) -> List[Dict[str, Any]]:
         """List all available models"""
-        models = []
-        
-        # Local models
-        for provider, config in self.local_models.items():
-            if config.get("available"):
-                models.append({
-                    "provider": provider,
-                    "type": "local",
-                    "models": config.get("models", []),
-                    "status": "online"
-                })
-        
-        # Cloud models
-        for provider, config in self.cloud_models.items():
-            if config.get("available"):
-                models.append({
-                    "provider": provider,
-                    "type": "cloud",
-                    "models": config.get("models", []),
-                    "status": "configured"
-                })
-        
-        return models
+        if self._models_cache is None:
+            self._models_cache = self._build_model_list()
+        return self._models_cache
+    
+    def _build_model_list(self) -> List[Dict[str, Any]]:
+        """Collect the available local and cloud models"""
+        # Providers are only registered once they're known to be available
+        return [
+            {"provider": provider, "type": "local", "models": config.get("models", []), "status": "online"}
+            for provider, config in self.local_models.items()
+        ] + [
+            {"provider": provider, "type": "cloud", "models": config.get("models", []), "status": "configured"}
+            for provider, config in self.cloud_models.items()
+        ]
     
     async def create_app_plan(
         self,
@@ -280,50 +486,9 @@ class AIOrchestrator:
             raise
     
     def _get_complexity_config(self, complexity: str) -> Dict[str, Any]:
-        """Get configuration based on app complexity level"""
-        configs = {
-            "basic": {
-                "estimated_time": "2-5 minutes",
-                "features_level": "essential",
-                "testing_coverage": "basic",
-                "optimization_level": "minimal",
-                "security_features": ["basic_auth", "input_validation"],
-                "caching": False,
-                "realtime_features": False,
-                "advanced_db": False,
-                "monitoring": False,
-                "ci_cd": False
-            },
-            "standard": {
-                "estimated_time": "5-10 minutes",
-                "features_level": "complete",
-                "testing_coverage": "comprehensive",
-                "optimization_level": "moderate",
-                "security_features": ["jwt_auth", "input_validation", "rate_limiting", "cors"],
-                "caching": True,
-                "realtime_features": False,
-                "advanced_db": True,
-                "monitoring": True,
-                "ci_cd": False
-            },
-            "advanced": {
-                "estimated_time": "10-20 minutes",
-                "features_level": "enterprise",
-                "testing_coverage": "complete",
-                "optimization_level": "maximum",
-                "security_features": ["jwt_auth", "oauth", "input_validation", "rate_limiting", 
-                                     "cors", "encryption", "security_headers", "audit_logs"],
-                "caching": True,
-                "realtime_features": True,
-                "advanced_db": True,
-                "monitoring": True,
-                "ci_cd": True,
-                "elasticsearch": True,
-                "message_queue": True,
-                "microservices": True
-            }
-        }
-        return configs.get(complexity, configs["standard"])
+        """Get configuration based on app complexity level (a copy; the plan owns it)"""
+        config = COMPLEXITY_CONFIGS.get(complexity, COMPLEXITY_CONFIGS["standard"])
+        return {**config, "security_features": list(config["security_features"])}
     
     async def _design_architecture(
         self,
@@ -333,12 +498,13 @@ class AIOrchestrator:
         complexity: str = "standard"
     ) -> Dict[str, Any]:
         """Design app architecture"""
+        prompt_lower = prompt.lower()
         architecture = {
-            "pattern": "microservices" if "api" in prompt.lower() or "backend" in prompt.lower() else "monolithic",
+            "pattern": "microservices" if "api" in prompt_lower or "backend" in prompt_lower else "monolithic",
             "layers": []
         }
         
-        if app_type in ["full-stack", "web"]:
+        if app_type in WEB_APP_TYPES:
             architecture["layers"].extend(["frontend", "backend", "database"])
         elif app_type == "backend":
             architecture["layers"].extend(["api", "business_logic", "database"])
@@ -352,25 +518,7 @@ class AIOrchestrator:
     
     def _identify_services(self, prompt: str) -> List[str]:
         """Identify required services from prompt"""
-        services = ["core"]
-        
-        keywords = {
-            "auth": ["login", "signup", "authentication", "user"],
-            "payment": ["payment", "checkout", "billing", "subscription"],
-            "storage": ["upload", "file", "image", "storage"],
-            "notification": ["notification", "email", "sms", "alert"],
-            "analytics": ["analytics", "tracking", "metrics"],
-            "search": ["search", "find", "query"],
-            "chat": ["chat", "messaging", "conversation"],
-            "realtime": ["realtime", "live", "websocket"]
-        }
-        
-        prompt_lower = prompt.lower()
-        for service, keywords_list in keywords.items():
-            if any(keyword in prompt_lower for keyword in keywords_list):
-                services.append(service)
-        
-        return services
+        return ["core"] + [service for service, pattern in SERVICE_PATTERNS.items() if pattern.search(prompt)]
     
     async def _select_tech_stack(self, app_type: str, platforms: List[str], complexity: str = "standard") -> Dict[str, List[str]]:
         """Select appropriate tech stack based on complexity"""
@@ -383,7 +531,7 @@ class AIOrchestrator:
         }
         
         # Frontend based on complexity
-        if app_type in ["full-stack", "web"] or "web" in platforms:
+        if app_type in WEB_APP_TYPES or "web" in platforms:
             if complexity == "basic":
                 tech_stack["frontend"] = ["React", "TailwindCSS"]
             elif complexity == "standard":
@@ -392,7 +540,7 @@ class AIOrchestrator:
                 tech_stack["frontend"] = ["React", "Next.js", "TypeScript", "TailwindCSS", "Framer Motion", "React Query"]
         
         # Backend based on complexity
-        if app_type in ["full-stack", "backend", "web"]:
+        if app_type in BACKEND_APP_TYPES:
             if complexity == "basic":
                 tech_stack["backend"] = ["FastAPI", "Python"]
             elif complexity == "standard":
@@ -409,7 +557,7 @@ class AIOrchestrator:
             tech_stack["database"] = ["PostgreSQL", "Redis", "Elasticsearch", "MongoDB"]
         
         # Mobile
-        if "android" in platforms or "ios" in platforms:
+        if not MOBILE_PLATFORMS.isdisjoint(platforms):
             tech_stack["mobile"] = ["Capacitor", "React Native", "Expo"]
         
         # DevOps
@@ -420,38 +568,23 @@ class AIOrchestrator:
     async def _extract_features(self, prompt: str, complexity: str = "standard") -> List[Dict[str, str]]:
         """Extract features from user prompt based on complexity"""
         features = []
+        prompt_lower = prompt.lower()
         
         # Base features for all complexity levels
-        if "user" in prompt.lower() or "login" in prompt.lower():
-            if complexity == "basic":
-                features.append({"name": "Simple User Authentication", "priority": "high"})
-            elif complexity == "standard":
-                features.append({"name": "User Authentication with JWT", "priority": "high"})
-            else:  # advanced
-                features.append({"name": "Advanced Authentication (JWT + OAuth + 2FA)", "priority": "high"})
+        if "user" in prompt_lower or "login" in prompt_lower:
+            features.append({"name": AUTH_FEATURE_BY_COMPLEXITY.get(complexity, ADVANCED_AUTH_FEATURE), "priority": "high"})
         
-        if "dashboard" in prompt.lower():
+        if "dashboard" in prompt_lower:
             features.append({"name": "Dashboard", "priority": "high"})
         
-        if "crud" in prompt.lower() or "manage" in prompt.lower():
+        if "crud" in prompt_lower or "manage" in prompt_lower:
             features.append({"name": "CRUD Operations", "priority": "high"})
         
-        if "api" in prompt.lower():
+        if "api" in prompt_lower:
             features.append({"name": "RESTful API", "priority": "high"})
         
         # Complexity-specific features
-        if complexity == "standard" or complexity == "advanced":
-            features.append({"name": "Error Handling & Logging", "priority": "high"})
-            features.append({"name": "Data Validation", "priority": "medium"})
-            features.append({"name": "Rate Limiting", "priority": "medium"})
-        
-        if complexity == "advanced":
-            features.append({"name": "Real-time Updates (WebSocket)", "priority": "medium"})
-            features.append({"name": "Advanced Search (Elasticsearch)", "priority": "medium"})
-            features.append({"name": "Caching Layer (Redis)", "priority": "medium"})
-            features.append({"name": "Background Jobs (Celery)", "priority": "medium"})
-            features.append({"name": "Monitoring & Analytics", "priority": "low"})
-            features.append({"name": "CI/CD Pipeline", "priority": "low"})
+        features.extend(dict(feature) for feature in FEATURES_BY_COMPLEXITY.get(complexity, ()))
         
         # Add core functionality
         features.append({"name": "Core Functionality", "priority": "high"})
@@ -462,7 +595,7 @@ class AIOrchestrator:
         """Plan app components"""
         components = []
         
-        if app_type in ["full-stack", "web"]:
+        if app_type in WEB_APP_TYPES:
             components.extend([
                 {"name": "HomePage", "type": "page", "description": "Landing page"},
                 {"name": "Dashboard", "type": "page", "description": "Main dashboard"},
@@ -474,44 +607,22 @@ class AIOrchestrator:
     
     async def _design_database(self, prompt: str, complexity: str = "standard") -> Dict[str, Any]:
         """Design database schema based on complexity"""
+        columns = USER_COLUMNS_BY_COMPLEXITY.get(complexity, _BASE_USER_COLUMNS)
         schema = {
             "tables": [
                 {
                     "name": "users",
-                    "columns": [
-                        {"name": "id", "type": "uuid", "primary_key": True},
-                        {"name": "email", "type": "string", "unique": True},
-                        {"name": "created_at", "type": "timestamp"}
-                    ]
+                    "columns": [dict(column) for column in columns]
                 }
             ],
             "relationships": []
         }
         
-        if complexity == "standard" or complexity == "advanced":
-            # Add more columns for standard/advanced
-            schema["tables"][0]["columns"].extend([
-                {"name": "updated_at", "type": "timestamp"},
-                {"name": "last_login", "type": "timestamp"},
-                {"name": "is_active", "type": "boolean"}
-            ])
-        
         if complexity == "advanced":
             # Add audit and advanced features
-            schema["tables"][0]["columns"].extend([
-                {"name": "roles", "type": "array"},
-                {"name": "permissions", "type": "json"},
-                {"name": "metadata", "type": "json"}
-            ])
             schema["tables"].append({
                 "name": "audit_logs",
-                "columns": [
-                    {"name": "id", "type": "uuid", "primary_key": True},
-                    {"name": "user_id", "type": "uuid", "foreign_key": "users.id"},
-                    {"name": "action", "type": "string"},
-                    {"name": "timestamp", "type": "timestamp"},
-                    {"name": "metadata", "type": "json"}
-                ]
+                "columns": [dict(column) for column in AUDIT_LOG_COLUMNS]
             })
         
         return schema
@@ -521,31 +632,8 @@ class AIOrchestrator:
         if app_type == "frontend":
             return []
         
-        endpoints = [
-            {"method": "GET", "path": "/api/health", "description": "Health check"},
-            {"method": "GET", "path": "/api/v1/items", "description": "List items"},
-            {"method": "POST", "path": "/api/v1/items", "description": "Create item"},
-            {"method": "GET", "path": "/api/v1/items/{id}", "description": "Get item"},
-            {"method": "PUT", "path": "/api/v1/items/{id}", "description": "Update item"},
-            {"method": "DELETE", "path": "/api/v1/items/{id}", "description": "Delete item"}
-        ]
-        
-        if complexity == "standard" or complexity == "advanced":
-            endpoints.extend([
-                {"method": "GET", "path": "/api/v1/items/search", "description": "Search items"},
-                {"method": "POST", "path": "/api/v1/items/bulk", "description": "Bulk create"},
-                {"method": "GET", "path": "/api/v1/stats", "description": "Get statistics"}
-            ])
-        
-        if complexity == "advanced":
-            endpoints.extend([
-                {"method": "GET", "path": "/api/v1/analytics", "description": "Analytics data"},
-                {"method": "WS", "path": "/ws/realtime", "description": "WebSocket real-time updates"},
-                {"method": "GET", "path": "/api/v1/export", "description": "Export data"},
-                {"method": "POST", "path": "/api/v1/import", "description": "Import data"}
-            ])
-        
-        return endpoints
+        endpoints = API_ENDPOINTS_BY_COMPLEXITY.get(complexity, _BASE_API_ENDPOINTS)
+        return [dict(endpoint) for endpoint in endpoints]
     
     async def _design_ui(self, prompt: str, platforms: List[str]) -> List[Dict[str, str]]:
         """Design UI components"""
@@ -662,15 +750,13 @@ class AIOrchestrator:
     
     def _parse_intent(self, text: str) -> str:
         """Parse user intent from text"""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ["create", "make", "build", "generate"]):
+        if CREATE_INTENT.search(text):
             return "create_app"
-        elif any(word in text_lower for word in ["analyze", "check", "look at", "examine"]):
+        elif ANALYZE_INTENT.search(text):
             return "analyze_repo"
-        elif "build" in text_lower and any(word in text_lower for word in ["android", "ios", "mobile"]):
+        elif BUILD_INTENT.search(text) and MOBILE_PLATFORM.search(text):
             return "build_app"
-        elif any(word in text_lower for word in ["help", "what can you do", "how do"]):
+        elif HELP_INTENT.search(text):
             return "help"
         else:
             return "unknown"
@@ -678,5 +764,6 @@ class AIOrchestrator:
     async def cleanup(self):
         """Cleanup resources"""
         logger.info("Cleaning up AI Orchestrator...")
-        # Close any open connections, cleanup resources
-        pass
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
@@ -10,18 +10,91 @@ Handles building apps for different platforms:
 import os
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+import functools
+from typing import Dict, Any, Tuple, FrozenSet
 from pathlib import Path
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Build output is read in chunks of this size; only the last OUTPUT_TAIL_BYTES are kept for error reports
+OUTPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_TAIL_BYTES = 4 * OUTPUT_CHUNK_SIZE
+
+# Upper bound on npm/gradle/npx processes running at once across all builds
+MAX_BUILD_PROCS = max(2, (os.cpu_count() or 2) // 2)
+
+@functools.lru_cache(maxsize=128)
+def _project_setup(project_path: str, dir_mtime: int) -> FrozenSet[str]:
+    """
+    Detect which mobile toolchains a project is set up for
+    
+    Keyed on the project dir's mtime, so a result is reused until files are
+    added to or removed from it.
+    """
+    root = Path(project_path)
+    setup = set()
+    
+    if (root / "capacitor.config.json").exists():
+        setup.add("capacitor")
+    if (root / "android").exists():
+        setup.add("react_native_android")
+    
+    return frozenset(setup)
+
+@functools.lru_cache(maxsize=128)
+def _uses_electron(package_json: str, package_mtime: int) -> bool:
+    """Check a package.json for an Electron dependency, reusing the result until the file changes"""
+    with open(package_json, 'rb') as f:
+        raw = f.read()
+    # Only parse manifests that mention electron at all
+    if b'"electron"' not in raw:
+        return False
+    package_data = orjson.loads(raw)
+    return "electron" in package_data.get("dependencies", {}) or \
+        "electron" in package_data.get("devDependencies", {})
+
 class BuildService:
     """Service for building apps across multiple platforms"""
     
     def __init__(self):
         self.build_cache_dir = Path("/tmp/my_builds")
         self.build_cache_dir.mkdir(exist_ok=True, parents=True)
+        self._proc_sem = asyncio.Semaphore(MAX_BUILD_PROCS)
+    
+    async def _run(self, *cmd: str, cwd: Path) -> Tuple[int, str]:
+        """Run a build command, streaming its combined output into a bounded tail buffer"""
+        async with self._proc_sem:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(cwd),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+            tail = bytearray()
+            while chunk := await proc.stdout.read(OUTPUT_CHUNK_SIZE):
+                tail += chunk
+                if len(tail) > OUTPUT_TAIL_BYTES:
+                    del tail[:-OUTPUT_TAIL_BYTES]
+            returncode = await proc.wait()
+        return returncode, tail.decode(errors="replace")
+    
+    def _detect_setup(self, project_path: Path) -> FrozenSet[str]:
+        """Cached mobile toolchain detection for a project (see _project_setup)"""
+        try:
+            dir_mtime = os.stat(project_path).st_mtime_ns
+        except FileNotFoundError:
+            return frozenset()
+        return _project_setup(str(project_path), dir_mtime)
+    
+    def _detect_electron(self, project_path: Path) -> bool:
+        """Cached Electron detection for a project (see _uses_electron)"""
+        package_json = project_path / "package.json"
+        try:
+            package_mtime = os.stat(package_json).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        return _uses_electron(str(package_json), package_mtime)
     
     async def build_web(self, project_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Build web application"""
@@ -38,25 +111,13 @@ class BuildService:
             if (frontend_path / "package.json").exists():
                 # Install dependencies
                 logger.info("Installing dependencies...")
-                proc = await asyncio.create_subprocess_exec(
-                    "npm", "install",
-                    cwd=str(frontend_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                await proc.communicate()
+                await self._run("npm", "install", cwd=frontend_path)
                 
                 # Build
                 logger.info("Building for production...")
-                proc = await asyncio.create_subprocess_exec(
-                    "npm", "run", "build",
-                    cwd=str(frontend_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await proc.communicate()
+                returncode, output = await self._run("npm", "run", "build", cwd=frontend_path)
                 
-                if proc.returncode == 0:
+                if returncode == 0:
                     return {
                         "status": "success",
                         "platform": "web",
@@ -67,7 +128,7 @@ class BuildService:
                     return {
                         "status": "error",
                         "platform": "web",
-                        "error": stderr.decode() if stderr else "Build failed"
+                        "error": output or "Build failed"
                     }
             else:
                 return {
@@ -90,15 +151,14 @@ class BuildService:
         
         try:
             project_path = Path(project_path)
+            setup = self._detect_setup(project_path)
             
             # Check for Capacitor
-            capacitor_config = project_path / "capacitor.config.json"
-            if capacitor_config.exists():
+            if "capacitor" in setup:
                 return await self._build_capacitor_android(project_path, options)
             
             # Check for React Native
-            android_dir = project_path / "android"
-            if android_dir.exists():
+            if "react_native_android" in setup:
                 return await self._build_react_native_android(project_path, options)
             
             # No mobile setup found, need to initialize
@@ -125,25 +185,13 @@ class BuildService:
         """Build using Capacitor"""
         try:
             # Sync web assets
-            proc = await asyncio.create_subprocess_exec(
-                "npx", "cap", "sync", "android",
-                cwd=str(project_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await proc.communicate()
+            await self._run("npx", "cap", "sync", "android", cwd=project_path)
             
             # Build APK
             android_path = project_path / "android"
-            proc = await asyncio.create_subprocess_exec(
-                "./gradlew", "assembleDebug",
-                cwd=str(android_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await proc.communicate()
+            returncode, output = await self._run("./gradlew", "assembleDebug", cwd=android_path)
             
-            if proc.returncode == 0:
+            if returncode == 0:
                 apk_path = android_path / "app/build/outputs/apk/debug/app-debug.apk"
                 return {
                     "status": "success",
@@ -156,7 +204,7 @@ class BuildService:
                 return {
                     "status": "error",
                     "platform": "android",
-                    "error": stderr.decode() if stderr else "Build failed"
+                    "error": output or "Build failed"
                 }
         
         except Exception as e:
@@ -167,15 +215,9 @@ class BuildService:
         """Build using React Native"""
         try:
             # Build APK
-            proc = await asyncio.create_subprocess_exec(
-                "npx", "react-native", "build-android", "--mode=release",
-                cwd=str(project_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await proc.communicate()
+            returncode, output = await self._run("npx", "react-native", "build-android", "--mode=release", cwd=project_path)
             
-            if proc.returncode == 0:
+            if returncode == 0:
                 apk_path = project_path / "android/app/build/outputs/apk/release/app-release.apk"
                 return {
                     "status": "success",
@@ -187,7 +229,7 @@ class BuildService:
                 return {
                     "status": "error",
                     "platform": "android",
-                    "error": stderr.decode() if stderr else "Build failed"
+                    "error": output or "Build failed"
                 }
         
         except Exception as e:
@@ -215,16 +257,9 @@ class BuildService:
             project_path = Path(project_path)
             
             # Check for Capacitor
-            capacitor_config = project_path / "capacitor.config.json"
-            if capacitor_config.exists():
+            if "capacitor" in self._detect_setup(project_path):
                 # Sync
-                proc = await asyncio.create_subprocess_exec(
-                    "npx", "cap", "sync", "ios",
-                    cwd=str(project_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                await proc.communicate()
+                await self._run("npx", "cap", "sync", "ios", cwd=project_path)
                 
                 return {
                     "status": "ready_for_xcode",
@@ -251,37 +286,25 @@ class BuildService:
             project_path = Path(project_path)
             
             # Check for Electron
-            package_json = project_path / "package.json"
-            if package_json.exists():
-                with open(package_json, 'r') as f:
-                    package_data = json.load(f)
-                    
-                if "electron" in package_data.get("dependencies", {}) or \
-                   "electron" in package_data.get("devDependencies", {}):
-                    # Build with Electron
-                    proc = await asyncio.create_subprocess_exec(
-                        "npm", "run", "build",
-                        cwd=str(project_path),
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE
-                    )
-                    await proc.communicate()
-                    
-                    proc = await asyncio.create_subprocess_exec(
-                        "npm", "run", "package",
-                        cwd=str(project_path),
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE
-                    )
-                    stdout, stderr = await proc.communicate()
-                    
-                    if proc.returncode == 0:
-                        return {
-                            "status": "success",
-                            "platform": "desktop",
-                            "output": str(project_path / "dist"),
-                            "message": "Desktop app built successfully"
-                        }
+            if self._detect_electron(project_path):
+                # Build with Electron
+                await self._run("npm", "run", "build", cwd=project_path)
+                
+                returncode, output = await self._run("npm", "run", "package", cwd=project_path)
+                
+                if returncode == 0:
+                    return {
+                        "status": "success",
+                        "platform": "desktop",
+                        "output": str(project_path / "dist"),
+                        "message": "Desktop app built successfully"
+                    }
+                else:
+                    return {
+                        "status": "error",
+                        "platform": "desktop",
+                        "error": output or "Build failed"
+                    }
             
             return {
                 "status": "pending_setup",
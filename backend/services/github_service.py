@@ -66,7 +66,13 @@ class GitHubService:
             logger.error(f"Failed to clone repository: {str(e)}")
             raise Exception(f"Failed to clone repository: {str(e)}")
     
+    # The *_sync analyses only depend on the path, so they can also run in a worker process
     async def analyze_repo(self, repo_path: str) -> Dict[str, Any]:
+        """Analyze repository structure and content without blocking the event loop"""
+        return await asyncio.to_thread(self.analyze_repo_sync, repo_path)
+    
+    @staticmethod
+    def analyze_repo_sync(repo_path: str) -> Dict[str, Any]:
         """
         Analyze repository structure and content
         
@@ -159,6 +165,11 @@ class GitHubService:
             raise Exception(f"Failed to analyze repository: {str(e)}")
     
     async def detect_tech_stack(self, repo_path: str) -> List[str]:
+        """Detect the technology stack used in the repository without blocking the event loop"""
+        return await asyncio.to_thread(self.detect_tech_stack_sync, repo_path)
+    
+    @staticmethod
+    def detect_tech_stack_sync(repo_path: str) -> List[str]:
         """
         Detect the technology stack used in the repository
         
@@ -314,6 +325,11 @@ class GitHubService:
             return []
     
     async def extract_dependencies(self, repo_path: str) -> Dict[str, List[str]]:
+        """Extract dependencies from various package managers without blocking the event loop"""
+        return await asyncio.to_thread(self.extract_dependencies_sync, repo_path)
+    
+    @staticmethod
+    def extract_dependencies_sync(repo_path: str) -> Dict[str, List[str]]:
         """
         Extract dependencies from various package managers
         
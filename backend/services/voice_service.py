@@ -9,11 +9,41 @@ Handles voice interaction using:
 import os
 import logging
 import base64
+import functools
+import importlib.util
+import concurrent.futures
 from typing import Optional
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Each model is loaded and used only on its own single worker thread: neither Whisper's
+# transcribe nor Coqui's tts_to_file is safe to run concurrently on one shared instance,
+# and it keeps two first-time callers from loading the model twice
+_whisper_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+_tts_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+
+@functools.cache
+def _whisper_model():
+    """Load the Whisper model on first use and keep it for later requests (whisper thread only)"""
+    import whisper
+    # Use base model for speed
+    return whisper.load_model("base")
+
+@functools.cache
+def _tts_model():
+    """Load the TTS model on first use and keep it for later requests (tts thread only)"""
+    from TTS.api import TTS
+    return TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC")
+
+def _transcribe_sync(path: str) -> dict:
+    """Transcribe an audio file (run on _whisper_executor)"""
+    return _whisper_model().transcribe(path)
+
+def _synthesize_sync(text: str, path: str):
+    """Synthesize text to a wav file (run on _tts_executor)"""
+    _tts_model().tts_to_file(text=text, file_path=path)
+
 class VoiceService:
     """Service for voice interaction capabilities"""
     
@@ -24,20 +54,17 @@ class VoiceService:
     
     def _check_availability(self):
         """Check if voice services are available"""
-        try:
-            # Check for Whisper
-            import whisper
+        # Only look the packages up; importing them pulls in torch and takes seconds
+        if importlib.util.find_spec("whisper") is not None:
             self.whisper_available = True
             logger.info("Whisper available for speech-to-text")
-        except ImportError:
+        else:
             logger.info("Whisper not available")
         
-        try:
-            # Check for TTS
-            import TTS
+        if importlib.util.find_spec("TTS") is not None:
             self.tts_available = True
             logger.info("TTS available for text-to-speech")
-        except ImportError:
+        else:
             logger.info("TTS not available")
     
     def is_available(self) -> bool:
@@ -58,7 +85,6 @@ class VoiceService:
             raise Exception("Whisper not available. Install with: pip install whisper")
         
         try:
-            import whisper
             import tempfile
             
             # Decode base64 audio
@@ -69,11 +95,9 @@ class VoiceService:
                 temp_audio.write(audio_bytes)
                 temp_path = temp_audio.name
             
-            # Load model (use base model for speed)
-            model = whisper.load_model("base")
-            
             # Transcribe
-            result = await asyncio.to_thread(model.transcribe, temp_path)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(_whisper_executor, _transcribe_sync, temp_path)
             
             # Cleanup
             os.unlink(temp_path)
@@ -99,17 +123,14 @@ class VoiceService:
             raise Exception("TTS not available. Install with: pip install TTS")
         
         try:
-            from TTS.api import TTS
             import tempfile
             
-            # Initialize TTS
-            tts = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC")
-            
             # Generate audio to temp file
             with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
                 temp_path = temp_audio.name
             
-            await asyncio.to_thread(tts.tts_to_file, text=text, file_path=temp_path)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(_tts_executor, _synthesize_sync, text, temp_path)
             
             # Read and encode
             with open(temp_path, "rb") as f: